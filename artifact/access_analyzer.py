@@ -7,24 +7,28 @@ Modes:
 - Necessity (-n): count combos C required across terms (every term ∩ C ≠ ∅).
 
 Usage:
-- python access_analyzer.py -s INPUT.csv COLUMN
-- python access_analyzer.py -n INPUT.csv COLUMN
+- python access_analyzer.py -s INPUT.csv COLUMN [--top K]
+- python access_analyzer.py -n INPUT.csv COLUMN [--top K]
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import re
 import sys
 from collections import Counter
-from itertools import combinations
 from pathlib import Path
-from typing import FrozenSet, Iterable, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 
 
 BRACKET_RE = re.compile(r"\[\s*([A-Z]+)\s*\]")
 
+# Parsed terms and expressions, shared across rows (datasets repeat them heavily)
+_TERM_CACHE: Dict[str, FrozenSet[str]] = {}
+_EXPR_CACHE: Dict[str, FrozenSet[FrozenSet[str]]] = {}
+
 
 def detect_dialect(path: Path) -> csv.Dialect:
     with path.open("r", encoding="utf-8-sig", newline="") as f:
@@ -37,18 +41,28 @@ def detect_dialect(path: Path) -> csv.Dialect:
         return csv.excel
 
 
-def parse_expr(expr: str | None) -> Set[FrozenSet[str]]:
+def _intern_term(grp: str) -> FrozenSet[str]:
+    # One shared frozenset per distinct term, whatever the letter order
+    term = _TERM_CACHE.get(grp)
+    if term is None:
+        term = frozenset(grp)
+        term = _TERM_CACHE.setdefault("".join(sorted(term)), term)
+        _TERM_CACHE[grp] = term
+    return term
+
+
+def parse_expr(expr: str | None) -> FrozenSet[FrozenSet[str]]:
     if not expr:
-        return set()
-    expr = expr.strip()
-    if not expr or expr == "-":
-        return set()
-    terms: Set[FrozenSet[str]] = set()
-    for grp in BRACKET_RE.findall(expr):
-        factors = tuple(ch for ch in grp if ch.isalpha())
-        if not factors:
-            continue
-        terms.add(frozenset(factors))
+        return frozenset()
+    terms = _EXPR_CACHE.get(expr)
+    if terms is None:
+        stripped = expr.strip()
+        if not stripped or stripped == "-":
+            terms = frozenset()
+        else:
+            # BRACKET_RE only captures [A-Z]+, so every group is a non-empty run of factors
+            terms = frozenset(_intern_term(grp) for grp in BRACKET_RE.findall(stripped))
+        _EXPR_CACHE[expr] = terms
     return terms
 
 
@@ -66,68 +80,101 @@ def format_set(s: Iterable[str]) -> str:
     return "".join(f"[{ch}]" for ch in sorted(s))
 
 
-def run_sufficiency(path: Path, column: str) -> int:
+def _rank_key(kv: Tuple[str, int]) -> Tuple[int, str]:
+    # Most frequent first, ties by pattern
+    return (-kv[1], kv[0])
+
+
+def print_counts(counts: Counter[str], top: int | None = None) -> None:
+    # With top, a heap selects only the K highest-ranked entries
+    if top is None:
+        ranked = sorted(counts.items(), key=_rank_key)
+    else:
+        ranked = heapq.nsmallest(top, counts.items(), key=_rank_key)
+    for pattern, cnt in ranked:
+        print(f"{pattern}: {cnt}")
+
+
+def count_sufficiency(path: Path, column: str) -> Counter[str]:
+    """Count rows per canonical pattern (OR-of-ANDs) in column."""
     dialect = detect_dialect(path)
     counts: Counter[str] = Counter()
     with path.open("r", encoding="utf-8-sig", newline="") as f:
-        rdr = csv.DictReader(f, dialect=dialect)
-        if not rdr.fieldnames or column not in rdr.fieldnames:
-            print(f"Input missing '{column}' column", file=sys.stderr)
-            return 1
+        rdr = csv.reader(f, dialect=dialect)
+        header = next(rdr, None)
+        if not header or column not in header:
+            raise SystemExit(f"Input missing '{column}' column")
+        col_i = {name: i for i, name in enumerate(header)}[column]
         for row in rdr:
-            expr_raw = (row.get(column) or "").strip()
+            if col_i >= len(row):
+                continue
+            expr_raw = row[col_i].strip()
             terms = parse_expr(expr_raw)
             if not terms:
                 continue
             canon = format_expr(terms)
             if canon:
                 counts[canon] += 1
-    for pattern, cnt in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        print(f"{pattern}: {cnt}")
-    return 0
+    return counts
 
 
-def run_necessity(path: Path, column: str) -> int:
+def count_necessity(path: Path, column: str) -> Counter[str]:
+    """Count rows per factor combo C that meets every term (term ∩ C ≠ ∅)."""
     dialect = detect_dialect(path)
     counts: Counter[str] = Counter()
     all_factors: Set[str] = set()
-    rows_terms: List[Set[FrozenSet[str]]] = []
+    rows_terms: List[FrozenSet[FrozenSet[str]]] = []
 
     with path.open("r", encoding="utf-8-sig", newline="") as f:
-        rdr = csv.DictReader(f, dialect=dialect)
-        if not rdr.fieldnames or column not in rdr.fieldnames:
-            print(f"Input missing '{column}' column", file=sys.stderr)
-            return 1
+        rdr = csv.reader(f, dialect=dialect)
+        header = next(rdr, None)
+        if not header or column not in header:
+            raise SystemExit(f"Input missing '{column}' column")
+        col_i = {name: i for i, name in enumerate(header)}[column]
         for row in rdr:
-            terms = parse_expr(row.get(column))
+            if col_i >= len(row):
+                continue
+            terms = parse_expr(row[col_i])
             if not terms:
-                rows_terms.append(set())
                 continue
             rows_terms.append(terms)
             for t in terms:
                 all_factors.update(t)
 
     if not rows_terms or not all_factors:
-        return 0
+        return counts
 
-    combos: List[FrozenSet[str]] = []
+    # Encode each term as a bitmask over the sorted factors so that the
+    # "term ∩ C ≠ ∅" test becomes a single integer AND. Smaller terms come
+    # first: a singleton term rejects any combo lacking that factor at once.
     factors_sorted = sorted(all_factors)
-    for r in range(1, len(factors_sorted) + 1):
-        for comb in combinations(factors_sorted, r):
-            combos.append(frozenset(comb))
+    bit = {f: 1 << i for i, f in enumerate(factors_sorted)}
+
+    # Rows with the same expression pass or fail every combo together, so
+    # each distinct expression is tested once and weighted by its row count
+    pattern_rows: Counter[Tuple[int, ...]] = Counter(
+        tuple(sorted((sum(bit[f] for f in term) for term in terms), key=lambda m: (bin(m).count("1"), m)))
+        for terms in rows_terms
+    )
 
-    for C in combos:
+    for C in range(1, 1 << len(factors_sorted)):
         cnt = 0
-        for terms in rows_terms:
-            if not terms:
-                continue
-            if all((len(term.intersection(C)) > 0) for term in terms):
-                cnt += 1
+        for masks, rows in pattern_rows.items():
+            if all(m & C for m in masks):
+                cnt += rows
         if cnt > 0:
-            counts[format_set(C)] = cnt
+            counts[format_set(f for f in factors_sorted if bit[f] & C)] = cnt
 
-    for pattern, cnt in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
-        print(f"{pattern}: {cnt}")
+    return counts
+
+
+def run_sufficiency(path: Path, column: str, top: int | None = None) -> int:
+    print_counts(count_sufficiency(path, column), top)
+    return 0
+
+
+def run_necessity(path: Path, column: str, top: int | None = None) -> int:
+    print_counts(count_necessity(path, column), top)
     return 0
 
 
@@ -138,16 +185,19 @@ def main(argv: List[str] | None = None) -> int:
     mode.add_argument("-n", "--necessity", action="store_true", help="Count required combos in column")
     p.add_argument("input", type=Path, help="Input CSV path")
     p.add_argument("column", type=str, help="Column name to analyze (e.g., 1FA, 2FA)")
+    p.add_argument("--top", type=int, default=None, metavar="K", help="Print only the K most frequent entries")
     args = p.parse_args(argv)
+    if args.top is not None and args.top < 1:
+        p.error("--top must be at least 1")
 
     if not args.input.exists():
         print(f"Input file not found: {args.input}", file=sys.stderr)
         return 1
 
     if args.sufficiency:
-        return run_sufficiency(args.input, args.column)
+        return run_sufficiency(args.input, args.column, args.top)
     else:
-        return run_necessity(args.input, args.column)
+        return run_necessity(args.input, args.column, args.top)
 
 
 if __name__ == "__main__":
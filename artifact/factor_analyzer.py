@@ -18,13 +18,17 @@ import argparse
 import csv
 import re
 import sys
-from itertools import combinations
+from collections import Counter
 from pathlib import Path
 from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 
 
 BRACKET_RE = re.compile(r"\[\s*([A-Z]+)\s*\]")
 
+# Parsed terms and expressions, shared across rows (datasets repeat them heavily)
+_TERM_CACHE: Dict[str, FrozenSet[str]] = {}
+_EXPR_CACHE: Dict[str, FrozenSet[FrozenSet[str]]] = {}
+
 
 def detect_dialect(path: Path) -> csv.Dialect:
     with path.open("r", encoding="utf-8-sig", newline="") as f:
@@ -37,22 +41,32 @@ def detect_dialect(path: Path) -> csv.Dialect:
         return csv.excel
 
 
-def parse_terms(expr: str | None) -> Set[FrozenSet[str]]:
+def _intern_term(grp: str) -> FrozenSet[str]:
+    # One shared frozenset per distinct term, whatever the letter order
+    term = _TERM_CACHE.get(grp)
+    if term is None:
+        term = frozenset(grp)
+        term = _TERM_CACHE.setdefault("".join(sorted(term)), term)
+        _TERM_CACHE[grp] = term
+    return term
+
+
+def parse_terms(expr: str | None) -> FrozenSet[FrozenSet[str]]:
     if not expr:
-        return set()
-    expr = expr.strip()
-    if not expr or expr == "-":
-        return set()
-    terms: Set[FrozenSet[str]] = set()
-    for grp in BRACKET_RE.findall(expr):
-        factors = tuple(ch for ch in grp if ch.isalpha())
-        if not factors:
-            continue
-        terms.add(frozenset(factors))
+        return frozenset()
+    terms = _EXPR_CACHE.get(expr)
+    if terms is None:
+        stripped = expr.strip()
+        if not stripped or stripped == "-":
+            terms = frozenset()
+        else:
+            # BRACKET_RE only captures [A-Z]+, so every group is a non-empty run of factors
+            terms = frozenset(_intern_term(grp) for grp in BRACKET_RE.findall(stripped))
+        _EXPR_CACHE[expr] = terms
     return terms
 
 
-def extract_singletons(terms: Set[FrozenSet[str]]) -> Set[str]:
+def extract_singletons(terms: Iterable[FrozenSet[str]]) -> Set[str]:
     return {next(iter(t)) for t in terms if len(t) == 1}
 
 
@@ -61,84 +75,140 @@ def fmt_combo(combo: Iterable[str]) -> str:
     return "{" + items + "}"
 
 
-def count_access_by_set(input_path: Path, col1: str, col2: str) -> None:
+def factor_counts(
+    input_path: Path, col1: str, col2: str
+) -> Tuple[List[Tuple[FrozenSet[str], int]], List[Tuple[FrozenSet[str], int, int]], int]:
+    """Compute both report sections.
+
+    Returns (woReset rows as (set, count1), woReset: wReset rows as
+    (set, count1, count2), denominator); sets are frozensets of factor
+    names, in no particular order.
+    """
     dialect = detect_dialect(input_path)
-    rows_terms_1: List[Set[FrozenSet[str]]] = []
-    rows_terms_2: List[Set[FrozenSet[str]]] = []
-    all_factors_1: Set[str] = set()
-    all_factors_2: Set[str] = set()
+    # Rows with the same (COL1, COL2) expressions count towards the same sets,
+    # so each distinct pair is kept once with its row count
+    pattern_rows: Counter[Tuple[FrozenSet[FrozenSet[str]], FrozenSet[FrozenSet[str]]]] = Counter()
 
     with input_path.open("r", encoding="utf-8-sig", newline="") as f:
-        rdr = csv.DictReader(f, dialect=dialect)
+        rdr = csv.reader(f, dialect=dialect)
+        header = next(rdr, None)
         for col in (col1, col2):
-            if not rdr.fieldnames or col not in rdr.fieldnames:
+            if not header or col not in header:
                 raise SystemExit(f"Missing required column: {col}")
+        idx = {name: i for i, name in enumerate(header)}
+        c1, c2 = idx[col1], idx[col2]
 
         for row in rdr:
-            t1 = parse_terms(row.get(col1))
-            t2 = parse_terms(row.get(col2))
-            rows_terms_1.append(t1)
-            rows_terms_2.append(t2)
-            for T in t1:
-                all_factors_1.update(T)
-            for T in t2:
-                all_factors_2.update(T)
-
-    # Generate all non-empty OR combinations from single factors observed in 1FA or Kmap1FA
-    combos: List[FrozenSet[str]] = []
-    pool = sorted(all_factors_1.union(all_factors_2))
-    for r in range(1, len(pool) + 1):
-        for comb in combinations(pool, r):
-            combos.append(frozenset(comb))
+            if not row:
+                continue
+            t1 = parse_terms(row[c1] if c1 < len(row) else None)
+            t2 = parse_terms(row[c2] if c2 < len(row) else None)
+            pattern_rows[t1, t2] += 1
+
+    all_factors: Set[str] = set()
+    for t1, t2 in pattern_rows:
+        for T in t1 | t2:
+            all_factors.update(T)
+
+    # All non-empty OR combinations of single factors observed in 1FA or
+    # Kmap1FA are visited as integer bitmasks over the pool; a combo is only
+    # turned back into factor names when it is reported
+    pool = sorted(all_factors)
+    n = len(pool)
+
+    def combo_factors(mask: int) -> FrozenSet[str]:
+        return frozenset(f for i, f in enumerate(pool) if mask >> i & 1)
+
+    # supersets[m] has bit C set for every combo C that contains term mask m
+    bit = {f: 1 << i for i, f in enumerate(pool)}
+    supersets: List[int] = [0] * (1 << n)
+    for C in range(1 << n):
+        sub = C
+        while True:
+            supersets[sub] |= 1 << C
+            if not sub:
+                break
+            sub = (sub - 1) & C
+
+    # A pattern grants access to C iff one of its terms is a subset of C, so
+    # its combos are the union of its terms' supersets. Patterns are folded
+    # into weights per combo bitset; the same pass counts the percentage
+    # denominator: rows where COL2 has any terms
+    term_access: Dict[FrozenSet[str], int] = {}
+
+    def access_of(terms: FrozenSet[FrozenSet[str]]) -> int:
+        access = 0
+        for term in terms:
+            a = term_access.get(term)
+            if a is None:
+                a = term_access[term] = supersets[sum(bit[f] for f in term)]
+            access |= a
+        return access
+
+    weights_1: Counter[int] = Counter()
+    weights_2: Counter[int] = Counter()
+    denom = 0
+    for (t1, t2), rows in pattern_rows.items():
+        weights_1[access_of(t1)] += rows
+        weights_2[access_of(t2)] += rows
+        if t2:
+            denom += rows
 
     # Count for 1FA and Kmap1FA
-    counts_1: Dict[FrozenSet[str], int] = {c: 0 for c in combos}
-    counts_2: Dict[FrozenSet[str], int] = {c: 0 for c in combos}
-
-    for c in combos:
-        # Access if any term is a subset of the factor set
-        for t1, t2 in zip(rows_terms_1, rows_terms_2):
-            if t1 and any(term.issubset(c) for term in t1):
-                counts_1[c] += 1
-            if t2 and any(term.issubset(c) for term in t2):
-                counts_2[c] += 1
-
-    # Extra top section: only woReset (col1) for sets containing P but not K
-    # Denominator: total number of rows where COL2 has any terms (>0),
-    # same as the two-column section below
-    denom_wo = sum(1 for t2 in rows_terms_2 if t2)
-    def fmt_one(count: int) -> str:
-        if denom_wo <= 0:
-            return f"0.0% ({count})"
-        return f"{(count/denom_wo)*100.0:.1f}% ({count})"
+    def count_1(mask: int) -> int:
+        return sum(rows for access, rows in weights_1.items() if access >> mask & 1)
+
+    def count_2(mask: int) -> int:
+        return sum(rows for access, rows in weights_2.items() if access >> mask & 1)
+
+    # Extra top section: only woReset (col1) for sets containing P but not K,
+    # built directly as P plus any subset of the other non-K factors
+    p_no_k_sets: List[Tuple[FrozenSet[str], int]] = []
+    if 'P' in bit:
+        others = ((1 << n) - 1) & ~bit['P'] & ~bit.get('K', 0)
+        sub = others
+        while True:
+            mask = bit['P'] | sub
+            cnt = count_1(mask)
+            if cnt > 0:
+                p_no_k_sets.append((combo_factors(mask), cnt))
+            if not sub:
+                break
+            sub = (sub - 1) & others
+
+    # Two-column section: only combos where the first count is <= the second count
+    selected: List[Tuple[FrozenSet[str], int, int]] = []
+    for mask in range(1, 1 << n):
+        cnt_1, cnt_2 = count_1(mask), count_2(mask)
+        if (cnt_1 <= cnt_2) and (cnt_1 > 0 or cnt_2 > 0):
+            selected.append((combo_factors(mask), cnt_1, cnt_2))
+
+    return p_no_k_sets, selected, denom
 
-    p_no_k_sets = [k for k in combos if ('P' in k) and ('K' not in k) and (counts_1[k] > 0)]
-    print("Factors: woReset")
-    for c in sorted(p_no_k_sets, key=lambda x: fmt_combo(x)):
-        print(f"{fmt_combo(c)}: {fmt_one(counts_1[c])}")
 
-    # Divider before the two-column section
-    print("=======")
-    # Print only combos where the first count is <= the second count
-    print("Factors: woReset: wReset")
-    selected = []
-    for k in combos:
-        if (counts_1[k] <= counts_2[k]) and (counts_1[k] > 0 or counts_2[k] > 0):
-            selected.append(k)
-
-    # Determine denominator for percentage: total number of rows where COL2 has any terms (>0)
-    # i.e., count of rows with a non-empty expression in the second column
-    denom = sum(1 for t2 in rows_terms_2 if t2)
+def count_access_by_set(input_path: Path, col1: str, col2: str) -> None:
+    p_no_k_sets, selected, denom = factor_counts(input_path, col1, col2)
+
+    # Denominator: total number of rows where COL2 has any terms (>0),
+    # shared by both sections
     def fmt(count: int) -> str:
         if denom <= 0:
             return f"0.0% ({count})"
         pct = (count / denom) * 100.0
         return f"{pct:.1f}% ({count})"
 
-    for c in sorted(selected, key=lambda x: fmt_combo(x)):
-        left = fmt(counts_1[c])
-        right = fmt(counts_2[c])
-        print(f"{fmt_combo(c)}: {left}; {right}")
+    # Each section is listed by set label
+    print("Factors: woReset")
+    for label, cnt in sorted((fmt_combo(combo), cnt) for combo, cnt in p_no_k_sets):
+        print(f"{label}: {fmt(cnt)}")
+
+    # Divider before the two-column section
+    print("=======")
+    print("Factors: woReset: wReset")
+    for label, cnt_1, cnt_2 in sorted((fmt_combo(combo), cnt_1, cnt_2) for combo, cnt_1, cnt_2 in selected):
+        left = fmt(cnt_1)
+        right = fmt(cnt_2)
+        print(f"{label}: {left}; {right}")
 
 
 def main(argv: List[str] | None = None) -> int:
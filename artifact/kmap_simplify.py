@@ -4,22 +4,26 @@ Karnaugh map minimization for access patterns
 
 Ouput: Kmap1FA, Kmap2FA (both minimal covers)
 
-Usage: python kmap_simplify.py INPUT.csv OUTPUT.csv [--output-delim same|comma|tab]
+Usage: python kmap_simplify.py INPUT.csv OUTPUT.csv [--output-delim same|comma|tab] [--jobs N]
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Set, List, Tuple
-from itertools import product
 
 
 BRACKET_RE = re.compile(r"\[\s*([A-Z]+)\s*\]")
 
+# Buffer size for CSV input/output
+_IO_BUFFER = 1 << 20
+
 
 def detect_dialect(path: Path) -> csv.Dialect:
     with path.open("r", encoding="utf-8-sig", newline="") as f:
@@ -47,45 +51,28 @@ def parse_expr_to_minterms(expr: str | None, variables: List[str]) -> Set[int]:
     if not expr or expr.strip() in ("", "-"):
         return set()
 
-    minterms = set()
-    terms = []
+    num_vars = len(variables)
+    bit_of = {v: 1 << (num_vars - 1 - i) for i, v in enumerate(variables)}
 
-    # Extract terms like [ABC], [AB], etc.
+    # Extract terms like [ABC], [AB], etc. as masks of required variables
+    term_masks = []
     for match in BRACKET_RE.findall(expr):
-        factors = [ch for ch in match if ch.isalpha()]
-        terms.append(set(factors))
+        factors = set(match)
+        if not factors.issubset(bit_of):
+            continue  # Term uses a variable outside `variables`: never satisfied
+        term_masks.append(sum(bit_of[f] for f in factors))
 
-    if not terms:
+    if not term_masks:
         return set()
 
-    # For each possible assignment of variables
-    for assignment in product([0, 1], repeat=len(variables)):
-        var_assignment = {variables[i]: assignment[i] for i in range(len(variables))}
+    # A minterm satisfies the expression (OR of terms) if it sets every bit
+    # of some term (AND of factors)
+    return {m for m in range(1 << num_vars) if any((m & tm) == tm for tm in term_masks)}
 
-        # Check if any term is satisfied (OR of terms)
-        term_satisfied = False
-        for term in terms:
-            # Check if this term is satisfied (AND of factors in term)
-            all_factors_true = True
-            for factor in term:
-                if factor not in var_assignment or var_assignment[factor] != 1:
-                    all_factors_true = False
-                    break
-            if all_factors_true:
-                term_satisfied = True
-                break
 
-        if term_satisfied:
-            # Convert assignment to minterm number
-            minterm = sum(assignment[i] * (2 ** (len(variables) - 1 - i)) for i in range(len(variables)))
-            minterms.add(minterm)
-
-    return minterms
-
-
-def adjacent_cells(cell1: int, cell2: int) -> bool:
-    """Check if two cells are adjacent in Karnaugh map (differ by exactly 1 bit)"""
-    return bin(cell1 ^ cell2).count('1') == 1
+def popcount(x: int) -> int:
+    """Number of set bits in x"""
+    return bin(x).count("1")
 
 
 def find_prime_implicants(minterms: Set[int]) -> List[Tuple[int, int]]:
@@ -93,34 +80,44 @@ def find_prime_implicants(minterms: Set[int]) -> List[Tuple[int, int]]:
     if not minterms:
         return []
 
-    # Combine adjacent groups
+    # Group terms by popcount: adjacent terms differ in exactly one bit, so
+    # a term in group k+1 can only pair with itself minus one set bit in
+    # group k, which is probed directly instead of scanning the group.
     prime_implicants = []
-    current_level = {minterm: minterm for minterm in minterms}  # term -> original minterm mask
+    current_level: Dict[int, Dict[int, int]] = {}  # popcount -> {term -> original minterm mask}
+    for minterm in minterms:
+        current_level.setdefault(popcount(minterm), {})[minterm] = minterm
 
     while current_level:
-        next_level = {}
+        next_level: Dict[int, Dict[int, int]] = {}
         used = set()
 
-        items = list(current_level.items())
-        for i in range(len(items)):
-            for j in range(i + 1, len(items)):
-                term1, mask1 = items[i]
-                term2, mask2 = items[j]
-
-                if adjacent_cells(term1, term2):
+        for k in sorted(current_level):
+            lower = current_level.get(k - 1)
+            if not lower:
+                continue
+            for term2, mask2 in current_level[k].items():
+                bits = term2
+                while bits:
+                    diff_bit = bits & -bits
+                    bits ^= diff_bit
+                    term1 = term2 ^ diff_bit
+                    mask1 = lower.get(term1)
+                    if mask1 is None:
+                        continue
                     # Combine terms
-                    diff_bit = term1 ^ term2
                     new_term = term1 & term2  # Common bits
                     new_mask = mask1 & mask2 & ~diff_bit  # Mask out differing bit
 
-                    next_level[new_term] = new_mask
+                    next_level.setdefault(k - 1, {})[new_term] = new_mask
                     used.add(term1)
                     used.add(term2)
 
         # Unused terms are prime implicants
-        for term, mask in current_level.items():
-            if term not in used:
-                prime_implicants.append((term, mask))
+        for group in current_level.values():
+            for term, mask in group.items():
+                if term not in used:
+                    prime_implicants.append((term, mask))
 
         current_level = next_level
 
@@ -143,45 +140,31 @@ def implicant_to_expr(implicant: Tuple[int, int], variables: List[str]) -> str:
     return "[" + "".join(factors) + "]"
 
 
-def get_covered_minterms(implicant: Tuple[int, int], num_vars: int) -> Set[int]:
-    """Get all minterms covered by a prime implicant"""
-    term, mask = implicant
-    covered = set()
-
-    # Generate all minterms that match this implicant
-    # For each don't-care bit, try both 0 and 1
-    dont_care_bits = []
-    for i in range(num_vars):
-        bit_pos = num_vars - 1 - i
-        if not (mask & (1 << bit_pos)):  # This bit is don't-care
-            dont_care_bits.append(bit_pos)
-
-    # Generate all combinations of don't-care bits
-    for dont_care_assignment in product([0, 1], repeat=len(dont_care_bits)):
-        minterm = term
-        for i, bit_value in enumerate(dont_care_assignment):
-            if bit_value:
-                minterm |= (1 << dont_care_bits[i])
-        covered.add(minterm)
-
-    return covered
-
-
 def essential_prime_implicant_cover(prime_implicants: List[Tuple[int, int]], minterms: Set[int], num_vars: int) -> List[Tuple[int, int]]:
     """Select essential prime implicants and then apply Petrick's method for exact minimal cover."""
     if not prime_implicants or not minterms:
         return prime_implicants
 
-    # Build coverage table: implicant -> set of covered minterms
+    # Build coverage table: implicant -> set of covered minterms, and its
+    # inverse: minterm -> implicants covering it (in implicant order)
     coverage = {}
+    pi_for_minterm: Dict[int, List[Tuple[int, int]]] = {m: [] for m in minterms}
+    # A minterm is covered when it matches the implicant on every cared-for
+    # bit, i.e. (m & care) == term
     for pi in prime_implicants:
-        coverage[pi] = get_covered_minterms(pi, num_vars) & minterms
+        if pi in coverage:
+            continue
+        term, mask = pi
+        care = mask | term
+        coverage[pi] = {m for m in minterms if m & care == term}
+        for m in coverage[pi]:
+            pi_for_minterm[m].append(pi)
 
     # Essential implicants: any minterm covered by exactly one implicant
     essential: List[Tuple[int, int]] = []
     covered_by_essential: Set[int] = set()
     for m in minterms:
-        covering = [pi for pi, cov in coverage.items() if m in cov]
+        covering = pi_for_minterm[m]
         if len(covering) == 1:
             epi = covering[0]
             if epi not in essential:
@@ -200,12 +183,12 @@ def essential_prime_implicant_cover(prime_implicants: List[Tuple[int, int]], min
     # Precompute literal counts per implicant (positive-only literals)
     literal_counts: List[int] = []
     for (_, mask) in pi_list:
-        literal_counts.append(bin(mask).count("1"))
+        literal_counts.append(popcount(mask))
 
     # Build Petrick clauses: for each remaining minterm, list indices of implicants that cover it
     clauses: List[Set[int]] = []
     for m in remaining:
-        idxs = {index_of[pi] for pi, cov in coverage.items() if m in cov}
+        idxs = {index_of[pi] for pi in pi_for_minterm[m]}
         # Protect against uncovered minterms (shouldn't happen if prime implicants computed correctly)
         if not idxs:
             continue
@@ -221,40 +204,62 @@ def essential_prime_implicant_cover(prime_implicants: List[Tuple[int, int]], min
 
     # Petrick's method: multiply sums (OR) into products (AND of implicants) and minimize
 
-    # Products are represented as frozensets of implicant indices
-    products: Set[frozenset[int]] = {frozenset()}
+    # Clauses and products are represented as int bitsets: bit i set iff implicant i is included
+    def indices(p: int) -> List[int]:
+        # Implicant indices in a bitset, ascending
+        out: List[int] = []
+        while p:
+            low = p & -p
+            out.append(low.bit_length() - 1)
+            p ^= low
+        return out
+
+    # Drop clauses that contain another clause: every product satisfying
+    # the smaller clause satisfies the larger one as well
+    kept_clauses: List[int] = []
+    for c in sorted({sum(1 << i for i in idxs) for idxs in clauses}, key=popcount):
+        if not any(k & c == k for k in kept_clauses):
+            kept_clauses.append(c)
+
+    products: Set[int] = {0}
+
+    def product_cost(p: int) -> tuple[int, int]:
+        return (popcount(p), sum(literal_counts[i] for i in indices(p)))
+
+    def reduce_products(prods: Set[int]) -> Set[int]:
+        # Remove any product that is a superset of another (absorption).
+        # In popcount order every possible subset is kept before its
+        # supersets, so either probe p's proper subsets (2^|p| lookups) or
+        # scan the kept products, whichever is smaller.
+        minimal: Set[int] = set()
+        for p in sorted(prods, key=popcount):
+            if (1 << popcount(p)) < len(minimal):
+                sub = (p - 1) & p
+                while sub and sub not in minimal:
+                    sub = (sub - 1) & p
+                absorbed = sub != 0
+            else:
+                absorbed = any(p & q == q for q in minimal)
+            if not absorbed:
+                minimal.add(p)
+        return minimal
 
-    def reduce_products(prods: Set[frozenset[int]]) -> Set[frozenset[int]]:
-        # Remove any product that is a superset of another (absorption)
-        minimal: List[frozenset[int]] = []
-        for p in sorted(prods, key=lambda s: (len(s), sum(literal_counts[i] for i in s))):
-            if any(p >= q for q in minimal):
-                continue
-            minimal.append(p)
-        return set(minimal)
-
-    for clause in clauses:
-        new_products: Set[frozenset[int]] = set()
-        for p in products:
-            for idx in clause:
-                new_products.add(p | {idx})
+    for clause in kept_clauses:
+        new_products = {p | (1 << idx) for p in products for idx in indices(clause)}
         products = reduce_products(new_products)
         if not products:
             # No possible cover
             return essential
 
     # Choose best products by (fewest implicants, then fewest total literals)
-    def product_cost(p: frozenset[int]) -> tuple[int, int]:
-        return (len(p), sum(literal_counts[i] for i in p))
-
     best_cost = min(product_cost(p) for p in products)
     best_products = [p for p in products if product_cost(p) == best_cost]
 
     # Pick one deterministically (smallest index tuple)
-    chosen = min(best_products, key=lambda p: tuple(sorted(p)))
+    chosen = min(best_products, key=indices)
 
     selected = essential[:]
-    selected.extend(pi_list[i] for i in sorted(chosen))
+    selected.extend(pi_list[i] for i in indices(chosen))
     return selected
 
 
@@ -294,9 +299,7 @@ def extract_variables(expr: str | None) -> Set[str]:
 
     variables = set()
     for match in BRACKET_RE.findall(expr):
-        for ch in match:
-            if ch.isalpha():
-                variables.add(ch)
+        variables.update(match)
     return variables
 
 
@@ -355,34 +358,84 @@ def compute_kmap(base_expr: str | None, reset_expr: str | None) -> str:
 
 
 
+def canonical_expr(expr: str | None) -> str:
+    """Canonical form of an expression: sorted, de-duplicated [..] terms.
+
+    Non-empty input without any terms maps to "-" so that it stays truthy
+    (a present-but-empty reset expression still removes P from the base).
+    """
+    if not expr:
+        return ""
+    terms = {"".join(sorted(set(grp))) for grp in BRACKET_RE.findall(expr)}
+    if not terms:
+        return "-"
+    return "".join("[" + t + "]" for t in sorted(terms))
+
+
+def read_records(path: Path, dialect: csv.Dialect) -> List[List[str]]:
+    """Read all records of a delimited file (blank lines become empty records)."""
+    with path.open("r", encoding="utf-8-sig", newline="", buffering=_IO_BUFFER) as f:
+        return list(csv.reader(f, dialect=dialect))
+
 
-def generate(input_path: Path, output_path: Path, *, output_delim: str = "same") -> None:
+def generate(input_path: Path, output_path: Path, *, output_delim: str = "same", jobs: int = 1) -> None:
     in_dialect = detect_dialect(input_path)
     out_dialect = pick_output_dialect(in_dialect, output_delim)
 
     required = ["ID", "1FA", "2FA", "Reset1FA", "Reset2FA"]
 
-    with input_path.open("r", encoding="utf-8-sig", newline="") as f_in, output_path.open(
-        "w", encoding="utf-8", newline=""
-    ) as f_out:
-        reader = csv.DictReader(f_in, dialect=in_dialect)
-        if not reader.fieldnames:
-            raise SystemExit("Input CSV has no header row.")
-        missing = [c for c in required if c not in reader.fieldnames]
-        if missing:
-            raise SystemExit(f"Missing required columns: {', '.join(missing)}")
-
-        # Build output header: original fields + ensure Kmap1FA, Kmap2FA appended
-        fieldnames: List[str] = list(reader.fieldnames)
-        for new_col in ("Kmap1FA", "Kmap2FA"):
-            if new_col not in fieldnames:
-                fieldnames.append(new_col)
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames, dialect=out_dialect)
-        writer.writeheader()
-
-        for row in reader:
-            row["Kmap1FA"] = compute_kmap(row.get("1FA"), row.get("Reset1FA"))
-            row["Kmap2FA"] = compute_kmap(row.get("2FA"), row.get("Reset2FA"))
+    records = read_records(input_path, in_dialect)
+    header = records[0] if records else []
+    if not header:
+        raise SystemExit("Input CSV has no header row.")
+    missing = [c for c in required if c not in header]
+    if missing:
+        raise SystemExit(f"Missing required columns: {', '.join(missing)}")
+
+    # Build output header: original fields + ensure Kmap1FA, Kmap2FA appended
+    fieldnames: List[str] = list(header)
+    for new_col in ("Kmap1FA", "Kmap2FA"):
+        if new_col not in fieldnames:
+            fieldnames.append(new_col)
+    idx = {name: i for i, name in enumerate(fieldnames)}
+    i_1fa, i_2fa, i_r1fa, i_r2fa = idx["1FA"], idx["2FA"], idx["Reset1FA"], idx["Reset2FA"]
+    i_k1fa, i_k2fa = idx["Kmap1FA"], idx["Kmap2FA"]
+    width = len(fieldnames)
+
+    rows: List[List[str]] = []
+    for num, row in enumerate(records[1:], start=1):
+        if not row:
+            continue
+        if len(row) > len(header):
+            raise ValueError(f"Row {num} has more fields than the header")
+        row.extend([""] * (width - len(row)))
+        rows.append(row)
+
+    # Minimize each distinct (base, reset) pair once; with jobs != 1 the
+    # pairs are spread over worker processes (0 = one per CPU)
+    pairs = [
+        (
+            (canonical_expr(row[i_1fa]), canonical_expr(row[i_r1fa])),
+            (canonical_expr(row[i_2fa]), canonical_expr(row[i_r2fa])),
+        )
+        for row in rows
+    ]
+    unique = list(dict.fromkeys(pair for row_pairs in pairs for pair in row_pairs))
+    if jobs == 1 or len(unique) < 2:
+        results = [compute_kmap(*pair) for pair in unique]
+    else:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            chunksize = max(1, len(unique) // (4 * workers))
+            results = list(ex.map(compute_kmap, *zip(*unique), chunksize=chunksize))
+    kmap = dict(zip(unique, results))
+
+    with output_path.open("w", encoding="utf-8", newline="", buffering=_IO_BUFFER) as f_out:
+        writer = csv.writer(f_out, dialect=out_dialect)
+        writer.writerow(fieldnames)
+        for row, (pair_1fa, pair_2fa) in zip(rows, pairs):
+            row[i_k1fa] = kmap[pair_1fa]
+            row[i_k2fa] = kmap[pair_2fa]
             writer.writerow(row)
 
 
@@ -396,7 +449,15 @@ def main(argv: list[str] | None = None) -> int:
         default="same",
         help="Delimiter for output (default: same as input)",
     )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for minimization (0 = one per CPU; default: 1)",
+    )
     args = p.parse_args(argv)
+    if args.jobs < 0:
+        p.error("--jobs must be 0 or a positive number of workers")
 
     if not args.input.exists():
         print(f"Input file not found: {args.input}", file=sys.stderr)
@@ -406,7 +467,7 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     try:
-        generate(args.input, args.output, output_delim=args.output_delim)
+        generate(args.input, args.output, output_delim=args.output_delim, jobs=args.jobs)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
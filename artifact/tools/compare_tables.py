@@ -1,41 +1,122 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import os
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import sys
 
+# The analyzer scripts live in artifact/, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import access_analyzer, factor_analyzer, kmap_simplify  # noqa: E402
+
+# Analyzer runs per table: key -> (script, arguments), paths relative to repo root
+ANALYSES={
+    't2_s':('access_analyzer', ['-s', 'artifact/data.csv', '1FA']),
+    't2_n':('access_analyzer', ['-n', 'artifact/data.csv', '1FA']),
+    't3_s':('access_analyzer', ['-s', 'artifact/data.csv', 'Reset1FA']),
+    't3_n':('access_analyzer', ['-n', 'artifact/data.csv', 'Reset1FA']),
+    't4_s':('access_analyzer', ['-s', 'artifact/data.csv', '2FA']),
+    't4_n':('access_analyzer', ['-n', 'artifact/data.csv', '2FA']),
+    't5_s':('access_analyzer', ['-s', 'artifact/data.csv', 'Reset2FA']),
+    't5_n':('access_analyzer', ['-n', 'artifact/data.csv', 'Reset2FA']),
+    't6_s':('access_analyzer', ['-s', 'artifact/data_with_kmap.csv', 'Kmap1FA']),
+    't7':('factor_analyzer', ['artifact/data_with_kmap.csv', '1FA', 'Kmap1FA']),
+    't8_s':('access_analyzer', ['-s', 'artifact/data_with_kmap.csv', 'Kmap2FA']),
+    't9':('factor_analyzer', ['artifact/data_with_kmap.csv', '2FA', 'Kmap2FA']),
+}
+
+# Per-table comparisons in report order: (summary key, report title, table, section, ANALYSES key)
+REPORTS=[
+    ('TABLE2_suff', 'TABLE 2 — 1FA Sufficiency', 'TABLE2', 'suff', 't2_s'),
+    ('TABLE2_nec', 'TABLE 2 — 1FA Necessity', 'TABLE2', 'nec', 't2_n'),
+    ('TABLE3_suff', 'TABLE 3 — Reset1FA Sufficiency', 'TABLE3', 'suff', 't3_s'),
+    ('TABLE3_nec', 'TABLE 3 — Reset1FA Necessity', 'TABLE3', 'nec', 't3_n'),
+    ('TABLE4_suff', 'TABLE 4 — 2FA Sufficiency', 'TABLE4', 'suff', 't4_s'),
+    ('TABLE4_nec', 'TABLE 4 — 2FA Necessity', 'TABLE4', 'nec', 't4_n'),
+    ('TABLE5_suff', 'TABLE 5 — Reset2FA Sufficiency', 'TABLE5', 'suff', 't5_s'),
+    ('TABLE5_nec', 'TABLE 5 — Reset2FA Necessity', 'TABLE5', 'nec', 't5_n'),
+    ('TABLE6_suff', 'TABLE 6 — Kmap1FA Sufficiency', 'TABLE6', 'suff', 't6_s'),
+    ('TABLE7', 'TABLE 7 — 1FA vs Kmap1FA Factors', 'TABLE7', 'factors', 't7'),
+    ('TABLE8_suff', 'TABLE 8 — Kmap2FA Sufficiency', 'TABLE8', 'suff', 't8_s'),
+    ('TABLE9', 'TABLE 9 — 2FA vs Kmap2FA Factors', 'TABLE9', 'factors', 't9'),
+]
+
 # Map LaTeX macros (single backslash in file) to single-letter tokens
 MACROS={"\\app":"A", "\\email":"E", "\\pk":"K", "\\pwd":"P", "\\sms":"S", "\\sq":"Q"}
+# Wrapper macros and punctuation dropped from expressions; \mobilex before \mobile and \implied before \imply
+DROP=('{', '}', '$', '\\access', '\\mobilex', '\\mobile', '\\implied', '\\imply', '\\myAnd', '(', ')')
+# Applied in order with str.replace, which beats a regex with a per-match callback
+_REPLACEMENTS=(*MACROS.items(), *((t,'') for t in DROP))
+
+# Patterns used per line when parsing LaTeX tables and analyzer output
+# Suff/nec row: expression in $...$, then non-greedily through the count in parentheses
+_SUFF_RE=re.compile(r"\$([^$]+)\$\s*&\s*.*?\((\d+)\)")
+# Factors row: $\{set\}$, optional alias like (=\mobilex), then the two columns
+_FACTORS_RE=re.compile(r"\$\\\{([^}]+)\\\}\$(?:\s*\([^)]*\))?\s*&\s*([^&]+?)&\s*([^\\\\]+)\\\\")
+_IMPLY_SPLIT=re.compile(r'\\implied|\\imply')
+_BSLASH_RE=re.compile(r"\\")
+_MYOR_RE=re.compile(r"\\?myOr")
+_MYAND_RE=re.compile(r"\\?myAnd")
+_COUNT_RE=re.compile(r"\((\d+)\)")
+# Analyzer output is scanned as a whole: each pattern is anchored to a line start and kept within the line
+_ACCESS_RE=re.compile(r"^[ \t]*(\[[A-Z]+(?:\]\[[A-Z]+)*\]):[ \t]*(\d+)", re.M)
+# Section markers (the longer one first: it also starts with 'Factors: woReset') or a '{set}: ...' row
+_FACTOR_LINE_RE=re.compile(r"^[ \t]*(?:(?P<wr>Factors: woReset: wReset)|(?P<wo>Factors: woReset)|\{(?P<set>[^}\n]+)\}:(?P<rest>.*))", re.M)
+# Count taken from the rest of a row: first parenthesised count, or the one after ';'
+_WO_COUNT_RE=re.compile(r"[^()]*\((\d+)\)")
+_WR_COUNT_RE=re.compile(r"[^;]+;[^()]*\((\d+)\)")
+
+class _CharFilter(dict):
+    """str.translate table deleting characters for which drop(ch) is true; each character is classified once."""
+    def __init__(self, drop):
+        super().__init__()
+        self.drop=drop
+    def __missing__(self, code):
+        keep=None if self.drop(chr(code)) else code
+        self[code]=keep
+        return keep
 
-def latex_to_tokens(rhs:str):
+_KEEP_ALPHA=_CharFilter(lambda ch: not ch.isalpha())
+_DEL_WS=_CharFilter(str.isspace)
+
+@lru_cache(maxsize=2048)
+def latex_to_tokens(rhs:str) -> tuple:
+    # Memoized: the same expressions recur across tables, so the result is an immutable tuple
+    # Map macros (\\email etc.) to letters and drop wrappers, then spacing
     s=rhs
-    # Map macros (\\email etc.) to letters
-    for k,v in MACROS.items():
-        s=s.replace(k,v)
-    # Drop wrappers and spacing
-    s=s.replace('{','').replace('}','').replace('$','')
-    s=s.replace('\\access','').replace('\\mobilex','').replace('\\mobile','')
-    s=s.replace('\\implied','').replace('\\imply','')
-    s=s.replace('\\myAnd','')
-    s=s.replace('(','').replace(')','')
-    s=re.sub(r"\s+","",s)
-    # First try splitting with explicit backslash
-    parts=[p for p in s.split('\\myOr') if p]
-    if len(parts)==1:
-        # If backslashes were stripped by LaTeX variant, split again without backslash
-        s2=s.replace('\\','')
-        s2=s2.replace('myAnd','')
-        parts=[p for p in s2.split('myOr') if p]
-    cleaned=[]
+    for old,new in _REPLACEMENTS:
+        s=s.replace(old,new)
+    s=s.translate(_DEL_WS)
+    # Split on \myOr, or bare myOr when a LaTeX variant stripped the backslashes
+    parts=[p for p in _MYOR_RE.split(s) if p]
+    return tuple(_MYAND_RE.sub('', p).translate(_KEEP_ALPHA) for p in parts)
+
+# Factor letters as bits; _BIT_STR[mask] is the sorted letter group for a mask
+_LETTER_BIT={ch:1<<i for i,ch in enumerate(sorted(MACROS.values()))}
+_BIT_STR=[''.join(ch for ch,b in _LETTER_BIT.items() if mask & b) for mask in range(1<<len(_LETTER_BIT))]
+
+def canonical_brackets(parts:tuple):
+    # Dedupe groups as letter bitmasks; anything outside the alphabet (or with
+    # repeated letters) keeps the plain sort-based path
+    masks=set()
     for p in parts:
-        p=p.replace('\\','').replace('myAnd','')
-        p=''.join(ch for ch in p if ch.isalpha())
-        cleaned.append(p)
-    return cleaned
+        if not p: continue
+        mask=0
+        for ch in p:
+            b=_LETTER_BIT.get(ch)
+            if b is None: return _canonical_brackets_sorted(parts)
+            mask|=b
+        if len(_BIT_STR[mask])!=len(p): return _canonical_brackets_sorted(parts)
+        masks.add(mask)
+    groups=sorted(_BIT_STR[m] for m in masks)
+    return ''.join('['+g+']' for g in groups)
 
-def canonical_brackets(parts):
+def _canonical_brackets_sorted(parts):
     groups=[]
     for p in parts:
         letters=''.join(sorted(p))
@@ -43,82 +124,94 @@ def canonical_brackets(parts):
     groups=sorted(set(groups))
     return ''.join('['+g+']' for g in groups) if groups else ''
 
+def _canon_set(items):
+    # Factor set key: order-free and hashable; turned into '{A, E}' text only by _render_set
+    return frozenset(i for i in (i.strip() for i in items) if i)
+
+def _render_set(key):
+    return '{'+', '.join(sorted(key))+'}'
+
+def _parse_count(s):
+    # Count in parentheses from a factors column, e.g. '30.6\% (15)'; None when the cell has none
+    mc=_COUNT_RE.search(s)
+    return int(mc.group(1)) if mc else None
+
+SKIP_PREFIXES=('%', '\\midrule', '\\toprule', '\\bottomrule')
+SECTION_HEADERS=(('Factor Sufficiency', 'suff'), ('Factor Necessity', 'nec'))
+# First character of a stripped line -> kind; anything else is plain text
+_LINE_KIND={'$':'row', '%':'skip', '\\':'macro', 'T':'total'}
+
 def parse_table(path:Path):
-    txt=path.read_text()
-    lines=[l.strip() for l in txt.splitlines()]
     section=None
     entries={'suff':[], 'nec':[], 'factors':[]}
-    for ln in lines:
-        if ln.startswith('%'):
-            continue
-        if 'Factor Sufficiency' in ln: section='suff'; continue
-        if 'Factor Necessity' in ln: section='nec'; continue
-        if 'Factors' in ln and 'w/o' in ln: section='factors'; continue
-        if ln.startswith('\\midrule') or ln.startswith('\\toprule') or not ln: continue
-        if ln.startswith('Total') or ln.startswith('\\end{tabular}'): section=None; continue
-        if section in ('suff','nec'):
-            # Match the expression in $...$ then non-greedily capture through the numeric count in parentheses.
-            # Use non-greedy '.*?' because LaTeX percentages appear as \\%, which breaks a negated class like [^%].
-            m=re.search(r"\$([^$]+)\$\s*&\s*.*?\((\d+)\)", ln)
-            if not m: continue
-            expr,count=m.group(1),int(m.group(2))
-            # Keep only RHS of implied/imply
-            rhs = re.split(r'\\implied|\\imply', expr, maxsplit=1)
-            expr_rhs = rhs[1] if len(rhs)>1 else expr
-            parts=latex_to_tokens(expr_rhs)
-            br=canonical_brackets(parts)
-            entries[section].append((br,count))
-        elif section=='factors':
-            # Allow optional alias like (=\mobilex) between the set and the first column
-            m=re.search(r"\$\\\{([^}]+)\\\}\$(?:\s*\([^)]*\))?\s*&\s*([^&]+?)&\s*([^\\\\]+)\\\\", ln)
-            if not m: continue
-            set_str,left,right=m.groups()
-            ss=set_str
-            for k,v in MACROS.items():
-                ss=ss.replace(k,v)
-            # Remove backslashes and spaces
-            ss=re.sub(r"\\", "", ss)
-            items=[i.strip() for i in ss.split(',')]
-            # Map word tokens to letters if any remain
-            word_map={'app':'A','email':'E','pk':'K','pwd':'P','sms':'S'}
-            items=[word_map.get(i,i) for i in items]
-            items=[i for i in items if i]
-            can='{'+', '.join(sorted(items))+'}'
-            def parse_count(s):
-                mc=re.search(r"\((\d+)\)", s)
-                return int(mc.group(1)) if mc else None
-            entries['factors'].append((can, parse_count(left), parse_count(right)))
+    # Rows often repeat an expression or set with a different count: canonicalize each distinct one once
+    expr_cache={}
+    set_cache={}
+    # Stream the file through its buffered reader rather than holding the text and its split copy
+    with path.open('r') as f:
+        for ln in (l.strip() for l in f):
+            if not ln: continue
+            # Dispatch on the first character: data rows ('$...') skip the prefix and header tests
+            kind=_LINE_KIND.get(ln[0])
+            if kind!='row':
+                # Comment and rule lines carry nothing
+                if kind=='skip' or (kind=='macro' and ln.startswith(SKIP_PREFIXES)): continue
+                if 'Factor' in ln:
+                    header=next((sec for needle,sec in SECTION_HEADERS if needle in ln), None)
+                    if header is None and 'Factors' in ln and 'w/o' in ln: header='factors'
+                    if header: section=header; continue
+                if (kind=='total' and ln.startswith('Total')) or (kind=='macro' and ln.startswith('\\end{tabular}')):
+                    section=None; continue
+            if section in ('suff','nec'):
+                # Match the expression in $...$ then non-greedily capture through the numeric count in parentheses.
+                # Use non-greedy '.*?' because LaTeX percentages appear as \\%, which breaks a negated class like [^%].
+                m=_SUFF_RE.search(ln)
+                if not m: continue
+                expr,count=m.group(1),int(m.group(2))
+                br=expr_cache.get(expr)
+                if br is None:
+                    # Keep only RHS of implied/imply
+                    rhs = _IMPLY_SPLIT.split(expr, maxsplit=1)
+                    expr_rhs = rhs[1] if len(rhs)>1 else expr
+                    parts=latex_to_tokens(expr_rhs)
+                    br=expr_cache[expr]=canonical_brackets(parts)
+                entries[section].append((br,count))
+            elif section=='factors':
+                # Allow optional alias like (=\mobilex) between the set and the first column
+                m=_FACTORS_RE.search(ln)
+                if not m: continue
+                set_str,left,right=m.groups()
+                can=set_cache.get(set_str)
+                if can is None:
+                    ss=set_str
+                    for k,v in MACROS.items():
+                        ss=ss.replace(k,v)
+                    # Remove backslashes and spaces
+                    ss=_BSLASH_RE.sub("", ss)
+                    items=[i.strip() for i in ss.split(',')]
+                    # Map word tokens to letters if any remain
+                    word_map={'app':'A','email':'E','pk':'K','pwd':'P','sms':'S'}
+                    can=set_cache[set_str]=_canon_set(word_map.get(i,i) for i in items)
+                entries['factors'].append((can, _parse_count(left), _parse_count(right)))
     return entries
 
-def run(cmd:str)->str:
-    return subprocess.check_output(cmd, shell=True, text=True)
+def run(argv:list)->str:
+    return subprocess.check_output(argv, text=True)
 
 def parse_access_output(s:str):
-    d={}
-    for line in s.splitlines():
-        line=line.strip()
-        m=re.match(r"(\[[A-Z]+(?:\]\[[A-Z]+)*\]):\s*(\d+)", line)
-        if m: d[m.group(1)]=int(m.group(2))
-    return d
+    return {m.group(1):int(m.group(2)) for m in _ACCESS_RE.finditer(s)}
 
 def parse_factor_output(s:str):
-    wo,wr={},{}
+    out={'wo':{}, 'wr':{}}
     current=None
-    for line in s.splitlines():
-        line=line.strip()
-        if line.startswith('Factors: woReset'): current='wo'; continue
-        if line.startswith('Factors: woReset: wReset'): current='wr'; continue
-        if current=='wo':
-            m=re.match(r"\{([^}]+)\}:\s*[^()]*\((\d+)\)", line)
-            if m:
-                key='{'+', '.join(sorted([x.strip() for x in m.group(1).split(',')]))+'}'
-                wo[key]=int(m.group(2))
-        elif current=='wr':
-            m=re.match(r"\{([^}]+)\}:\s*[^;]+;\s*[^()]*\((\d+)\)", line)
-            if m:
-                key='{'+', '.join(sorted([x.strip() for x in m.group(1).split(',')]))+'}'
-                wr[key]=int(m.group(2))
-    return wo,wr
+    # Only marker and row lines come back from the regex engine
+    for m in _FACTOR_LINE_RE.finditer(s):
+        if m.group('wr'): current='wr'
+        elif m.group('wo'): current='wo'
+        elif current:
+            mc=(_WO_COUNT_RE if current=='wo' else _WR_COUNT_RE).match(m.group('rest'))
+            if mc: out[current][_canon_set(m.group('set').split(','))]=int(mc.group(1))
+    return out['wo'],out['wr']
 
 def diff_entries(got:dict, exp:list):
     mismatches=[]
@@ -128,14 +221,24 @@ def diff_entries(got:dict, exp:list):
             mismatches.append((br, count, g))
     return mismatches
 
+def diff_factors(wo:dict, wr:dict, exp:list):
+    mismatches=[]
+    for can,l,r in exp:
+        gv_wo=wo.get(can)
+        gv_wr=wr.get(can)
+        if l is not None and gv_wo!=l: mismatches.append((_render_set(can), 'wo', l, gv_wo))
+        if r is not None and gv_wr!=r: mismatches.append((_render_set(can), 'wr', r, gv_wr))
+    return mismatches
+
 def find_tables_dir() -> Path:
     candidates = [
         Path('Tables'),
         Path('claims')/ 'Tables',
         Path('artifact')/ 'Tables',
     ]
+    # First directory wins; is_dir() also skips a stray file named like a candidate
     for c in candidates:
-        if c.exists():
+        if c.is_dir():
             return c
     raise FileNotFoundError('Could not locate Tables directory. Checked: ' + ', '.join(str(c) for c in candidates))
 
@@ -147,134 +250,100 @@ def table_path(base: Path, stem: str) -> Path:
     p2 = base / stem
     return p2
 
-def main():
+def build_outputs_subprocess():
     # Ensure K-map CSV exists
-    run('python3 artifact/kmap_simplify.py artifact/data.csv artifact/data_with_kmap.csv --output-delim same')
+    run([sys.executable, 'artifact/kmap_simplify.py', 'artifact/data.csv', 'artifact/data_with_kmap.csv', '--output-delim', 'same'])
+
+    # Independent once the K-map CSV exists, so run them concurrently
+    cmds={key:[sys.executable, f'artifact/{script}.py', *args] for key,(script,args) in ANALYSES.items()}
+    with ThreadPoolExecutor(max_workers=min(len(cmds), os.cpu_count() or 1)) as ex:
+        outs=dict(zip(cmds, ex.map(run, cmds.values())))
+    return {key:(parse_factor_output(out) if ANALYSES[key][0]=='factor_analyzer' else parse_access_output(out))
+            for key,out in outs.items()}
+
+def build_outputs_inprocess():
+    kmap_simplify.generate(Path('artifact/data.csv'), Path('artifact/data_with_kmap.csv'), output_delim='same')
+    outs={}
+    for key,(script,args) in ANALYSES.items():
+        if script=='factor_analyzer':
+            wo_rows,wr_rows,_=factor_analyzer.factor_counts(Path(args[0]), args[1], args[2])
+            outs[key]=({combo:c1 for combo,c1 in wo_rows}, {combo:c2 for combo,_,c2 in wr_rows})
+        elif args[0]=='-s':
+            outs[key]=dict(access_analyzer.count_sufficiency(Path(args[1]), args[2]))
+        else:
+            outs[key]=dict(access_analyzer.count_necessity(Path(args[1]), args[2]))
+    return outs
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(description="Verify that artifact outputs match the paper's LaTeX tables")
+    ap.add_argument('--subprocess', action='store_true', help='Run each analyzer as a separate command (as the claim scripts do) instead of in-process')
+    args=ap.parse_args(argv)
 
     # Build outputs
-    pa_t2_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data.csv 1FA'))
-    pa_t2_n=parse_access_output(run('python3 artifact/access_analyzer.py -n artifact/data.csv 1FA'))
-    pa_t3_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data.csv Reset1FA'))
-    pa_t3_n=parse_access_output(run('python3 artifact/access_analyzer.py -n artifact/data.csv Reset1FA'))
-    pa_t4_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data.csv 2FA'))
-    pa_t4_n=parse_access_output(run('python3 artifact/access_analyzer.py -n artifact/data.csv 2FA'))
-    pa_t5_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data.csv Reset2FA'))
-    pa_t5_n=parse_access_output(run('python3 artifact/access_analyzer.py -n artifact/data.csv Reset2FA'))
-    pa_t6_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data_with_kmap.csv Kmap1FA'))
-    wo7,wr7=parse_factor_output(run('python3 artifact/factor_analyzer.py artifact/data_with_kmap.csv 1FA Kmap1FA'))
-    pa_t8_s=parse_access_output(run('python3 artifact/access_analyzer.py -s artifact/data_with_kmap.csv Kmap2FA'))
-    wo9,wr9=parse_factor_output(run('python3 artifact/factor_analyzer.py artifact/data_with_kmap.csv 2FA Kmap2FA'))
+    outs=build_outputs_subprocess() if args.subprocess else build_outputs_inprocess()
 
     # Parse LaTeX (support multiple locations and .tex extension)
     T = find_tables_dir()
-    lt2=parse_table(table_path(T,'TABLE2'))
-    lt3=parse_table(table_path(T,'TABLE3'))
-    lt4=parse_table(table_path(T,'TABLE4'))
-    lt5=parse_table(table_path(T,'TABLE5'))
-    lt6=parse_table(table_path(T,'TABLE6'))
-    lt7=parse_table(table_path(T,'TABLE7'))
-    lt8=parse_table(table_path(T,'TABLE8'))
-    lt9=parse_table(table_path(T,'TABLE9'))
+    tables={stem:parse_table(table_path(T,stem)) for stem in dict.fromkeys(stem for _,_,stem,_,_ in REPORTS)}
 
     # Guard: if any expected section parsed zero rows, flag a parse issue
     parse_issue=False
-    def chk(name, lst):
-        nonlocal parse_issue
-        if len(lst)==0:
+    for _,_,stem,section,_ in REPORTS:
+        if len(tables[stem][section])==0:
             parse_issue=True
-            print(f"[WARN] Parsed 0 rows for {name}; check LaTeX format or regex.")
-    chk('TABLE2_suff', lt2['suff']); chk('TABLE2_nec', lt2['nec'])
-    chk('TABLE3_suff', lt3['suff']); chk('TABLE3_nec', lt3['nec'])
-    chk('TABLE4_suff', lt4['suff']); chk('TABLE4_nec', lt4['nec'])
-    chk('TABLE5_suff', lt5['suff']); chk('TABLE5_nec', lt5['nec'])
-    chk('TABLE6_suff', lt6['suff'])
-    chk('TABLE7_factors', lt7['factors'])
-    chk('TABLE8_suff', lt8['suff'])
-    chk('TABLE9_factors', lt9['factors'])
-
-    mismatches={}
-    mismatches['TABLE2_suff']=diff_entries(pa_t2_s, lt2['suff'])
-    mismatches['TABLE2_nec']=diff_entries(pa_t2_n, lt2['nec'])
-    mismatches['TABLE3_suff']=diff_entries(pa_t3_s, lt3['suff'])
-    mismatches['TABLE3_nec']=diff_entries(pa_t3_n, lt3['nec'])
-    mismatches['TABLE4_suff']=diff_entries(pa_t4_s, lt4['suff'])
-    mismatches['TABLE4_nec']=diff_entries(pa_t4_n, lt4['nec'])
-    mismatches['TABLE5_suff']=diff_entries(pa_t5_s, lt5['suff'])
-    mismatches['TABLE5_nec']=diff_entries(pa_t5_n, lt5['nec'])
-    mismatches['TABLE6_suff']=diff_entries(pa_t6_s, lt6['suff'])
-    mismatches['TABLE8_suff']=diff_entries(pa_t8_s, lt8['suff'])
-    # Factors tables
-    m7=[]
-    for can,l,r in lt7['factors']:
-        gv_wo=wo7.get(can)
-        gv_wr=wr7.get(can)
-        if l is not None and gv_wo!=l: m7.append((can, 'wo', l, gv_wo))
-        if r is not None and gv_wr!=r: m7.append((can, 'wr', r, gv_wr))
-    mismatches['TABLE7']=m7
-    m9=[]
-    for can,l,r in lt9['factors']:
-        gv_wo=wo9.get(can)
-        gv_wr=wr9.get(can)
-        if l is not None and gv_wo!=l: m9.append((can, 'wo', l, gv_wo))
-        if r is not None and gv_wr!=r: m9.append((can, 'wr', r, gv_wr))
-    mismatches['TABLE9']=m9
-
-    # Detailed per-row report helpers
-    def to_dict(pairs):
-        return {k:v for k,v in pairs}
+            print(f"[WARN] Parsed 0 rows for {stem}_{section}; check LaTeX format or regex.")
 
+    # Detailed per-row report helpers; each report is collected and written to stdout at once
     def print_access_report(title, got:dict, exp_pairs:list):
-        print(f"\n=== {title} ===")
-        exp = to_dict(exp_pairs)
+        out=[f"\n=== {title} ==="]
         # Preserve LaTeX order, then list extras
-        seen=set()
+        seen={br for br,_ in exp_pairs}
         for br,count in exp_pairs:
-            seen.add(br)
             gv = got.get(br)
             status = 'OK' if gv==count else 'DIFF'
-            print(f"{br:>20}: expected={count:>2} got={str(gv):>2} [{status}]")
+            out.append(f"{br:>20}: expected={count:>2} got={str(gv):>2} [{status}]")
         # Extras present in script but not in LaTeX
-        extras = sorted(set(got.keys())-seen)
+        extras = sorted(got.keys()-seen)
         if extras:
-            print("-- Extra rows present in script output --")
+            out.append("-- Extra rows present in script output --")
             for br in extras:
-                print(f"{br:>20}: expected= -  got={got[br]}")
+                out.append(f"{br:>20}: expected= -  got={got[br]}")
+        sys.stdout.write('\n'.join(out)+'\n')
 
     def print_factors_report(title, wo:dict, wr:dict, exp_rows:list):
-        print(f"\n=== {title} ===")
-        seen=set()
+        out=[f"\n=== {title} ==="]
+        seen={can for can,_,_ in exp_rows}
         for can,l,r in exp_rows:
-            seen.add(can)
             gv_wo = wo.get(can)
             gv_wr = wr.get(can)
             st_wo = 'OK' if (l is None or gv_wo==l) else 'DIFF'
             st_wr = 'OK' if (r is None or gv_wr==r) else 'DIFF'
-            print(f"{can:>20}: woReset expected={str(l):>2} got={str(gv_wo):>2} [{st_wo}]  |  wReset expected={str(r):>2} got={str(gv_wr):>2} [{st_wr}]")
+            out.append(f"{_render_set(can):>20}: woReset expected={str(l):>2} got={str(gv_wo):>2} [{st_wo}]  |  wReset expected={str(r):>2} got={str(gv_wr):>2} [{st_wr}]")
         # Extras
-        extra_wo = sorted(set(wo.keys())-seen)
-        extra_wr = sorted(set(wr.keys())-seen)
+        # Order extras by their rendered text; frozensets only compare by inclusion
+        extra_wo = sorted((_render_set(can), wo[can]) for can in wo.keys()-seen)
+        extra_wr = sorted((_render_set(can), wr[can]) for can in wr.keys()-seen)
         if extra_wo:
-            print("-- Extra woReset sets present in script output --")
-            for can in extra_wo:
-                print(f"{can:>20}: expected= -  got={wo[can]}")
+            out.append("-- Extra woReset sets present in script output --")
+            for label,got in extra_wo:
+                out.append(f"{label:>20}: expected= -  got={got}")
         if extra_wr:
-            print("-- Extra wReset sets present in script output --")
-            for can in extra_wr:
-                print(f"{can:>20}: expected= -  got={wr[can]}")
-
-    # Print detailed reports per table
-    print_access_report('TABLE 2 — 1FA Sufficiency', pa_t2_s, lt2['suff'])
-    print_access_report('TABLE 2 — 1FA Necessity',   pa_t2_n, lt2['nec'])
-    print_access_report('TABLE 3 — Reset1FA Sufficiency', pa_t3_s, lt3['suff'])
-    print_access_report('TABLE 3 — Reset1FA Necessity',   pa_t3_n, lt3['nec'])
-    print_access_report('TABLE 4 — 2FA Sufficiency', pa_t4_s, lt4['suff'])
-    print_access_report('TABLE 4 — 2FA Necessity',   pa_t4_n, lt4['nec'])
-    print_access_report('TABLE 5 — Reset2FA Sufficiency', pa_t5_s, lt5['suff'])
-    print_access_report('TABLE 5 — Reset2FA Necessity',   pa_t5_n, lt5['nec'])
-    print_access_report('TABLE 6 — Kmap1FA Sufficiency',  pa_t6_s, lt6['suff'])
-    print_factors_report('TABLE 7 — 1FA vs Kmap1FA Factors', wo7, wr7, lt7['factors'])
-    print_access_report('TABLE 8 — Kmap2FA Sufficiency',  pa_t8_s, lt8['suff'])
-    print_factors_report('TABLE 9 — 2FA vs Kmap2FA Factors', wo9, wr9, lt9['factors'])
+            out.append("-- Extra wReset sets present in script output --")
+            for label,got in extra_wr:
+                out.append(f"{label:>20}: expected= -  got={got}")
+        sys.stdout.write('\n'.join(out)+'\n')
+
+    # Compare and print detailed reports per table; the final summary lists access tables before factors tables
+    mismatches={key:[] for key,_,_,section,_ in sorted(REPORTS, key=lambda r: r[3]=='factors')}
+    for key,title,stem,section,out in REPORTS:
+        exp=tables[stem][section]
+        if section=='factors':
+            wo,wr=outs[out]
+            mismatches[key]=diff_factors(wo, wr, exp)
+            print_factors_report(title, wo, wr, exp)
+        else:
+            mismatches[key]=diff_entries(outs[out], exp)
+            print_access_report(title, outs[out], exp)
 
     # Final summary
     any_mis=False